@@ -1,6 +1,10 @@
 #!/usr/bin/python3
+import argparse
+import multiprocessing
 import sys
 
+CHUNK_SIZE = 1 << 20
+
 def main():
 	_ = True
 	isterm = sys.stdin.isatty()
@@ -30,5 +34,63 @@ def main():
 			_ = False
 	return
 
+def check_names(text):
+	#проверка без исключений: возвращает приветствия, ошибки и их количество
+	greetings = []
+	errors = []
+	for data in text.split():
+		if not data.isalpha():
+			errors.append(f"Ошибка: {data} - не является именем!\n")
+		elif data[0].islower():
+			errors.append(f"Ошибка: {data} - имя должно начинаться с заглавной буквы!\n")
+		else:
+			greetings.append(f"{data}, приятно познакомиться!\n")
+	return "".join(greetings), "".join(errors), len(greetings), len(errors)
+
+def read_chunks(stream, size):
+	#читаем блоки по size символов, даже если все имена в одной строке;
+	#незаконченное имя в конце блока переносится в следующий блок
+	tail = ""
+	while True:
+		block = stream.read(size)
+		if not block:
+			break
+		text = tail + block
+		end = len(text)
+		while end and not text[end - 1].isspace():
+			end -= 1
+		tail = text[end:]
+		if end:
+			yield text[:end]
+	if tail:
+		yield tail
+
+def batch(jobs=1, size=CHUNK_SIZE):
+	chunks = read_chunks(sys.stdin, size)
+	accepted = rejected = 0
+	pool = multiprocessing.Pool(jobs) if jobs > 1 else None
+	try:
+		#imap сохраняет порядок частей, как при последовательной обработке
+		results = pool.imap(check_names, chunks) if pool else map(check_names, chunks)
+		for greetings, errors, ok, bad in results:
+			sys.stdout.write(greetings)
+			sys.stderr.write(errors)
+			accepted += ok
+			rejected += bad
+	finally:
+		if pool:
+			pool.close()
+			pool.join()
+	sys.stdout.flush()
+	print(f"Принято: {accepted}, отклонено: {rejected}", file=sys.stderr)
+	return
+
 if __name__ == "__main__":
-	main()
+	parser = argparse.ArgumentParser()
+	parser.add_argument("--batch", action="store_true", help="неинтерактивная обработка больших файлов")
+	parser.add_argument("--jobs", type=int, default=1, help="число процессов в режиме --batch")
+	args = parser.parse_args()
+	if args.batch:
+		batch(args.jobs)
+	else:
+		main()
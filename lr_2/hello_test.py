@@ -0,0 +1,55 @@
+import io
+import os
+import sys
+
+import pytest
+
+from hello import batch, check_names, read_chunks
+
+
+def test_read_chunks_single_line():
+	# длинная строка без переводов строки делится на несколько частей
+	names = " ".join(f"Name{'x' * (i % 7)}" for i in range(1000))
+	chunks = list(read_chunks(io.StringIO(names), 64))
+	assert len(chunks) > 1
+	# имена не разрываются между частями
+	assert [name for chunk in chunks for name in chunk.split()] == names.split()
+
+
+def test_check_names():
+	greetings, errors, accepted, rejected = check_names("Ashly daniel _Eve\nBob")
+	assert greetings == "Ashly, приятно познакомиться!\nBob, приятно познакомиться!\n"
+	assert accepted == 2
+	assert rejected == 2
+	assert "daniel - имя должно начинаться с заглавной буквы!" in errors
+	assert "_Eve - не является именем!" in errors
+
+
+def run_batch(monkeypatch, text, jobs):
+	stdout = io.StringIO()
+	stderr = io.StringIO()
+	monkeypatch.setattr(sys, "stdin", io.StringIO(text))
+	monkeypatch.setattr(sys, "stdout", stdout)
+	monkeypatch.setattr(sys, "stderr", stderr)
+	batch(jobs, size=16)
+	return stdout.getvalue(), stderr.getvalue()
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_batch(monkeypatch, jobs):
+	with open(os.path.join(os.path.dirname(__file__), "name.txt")) as f:
+		text = f.read() * 5
+
+	stdout, stderr = run_batch(monkeypatch, text, jobs)
+
+	# вывод в порядке ввода, как в интерактивном режиме
+	assert stdout == (
+		"Ashly, приятно познакомиться!\n"
+		"Bob, приятно познакомиться!\n"
+		"Chester, приятно познакомиться!\n"
+	) * 5
+	assert stderr == (
+		"Ошибка: daniel - имя должно начинаться с заглавной буквы!\n"
+		"Ошибка: _Eve - не является именем!\n"
+		"Ошибка: freDDy - имя должно начинаться с заглавной буквы!\n"
+	) * 5 + "Принято: 15, отклонено: 15\n"
@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 import math
 import csv
 import os
+import tempfile
+import threading
 
 
 class SingletonMeta(type):
@@ -14,15 +17,130 @@ class SingletonMeta(type):
         return cls._instances[cls]
 
 
-class Database(metaclass=SingletonMeta):
+_MISSING = object()
 
-    def __init__(self):
-        self.tables = {}
 
-    def registerTable(self, tableName, table):
-        if tableName in self.tables:
-            raise ValueError(f"Table {tableName} already exists.")
-        self.tables[tableName] = table
+class Schema:
+    """
+    Общее для всех записей таблицы описание атрибутов:
+    кортеж имён и индекс имя -> позиция значения в записи.
+    """
+
+    __slots__ = ("attrs", "index")
+
+    def __init__(self, attrs):
+        self.attrs = tuple(attrs)
+        self.index = {attr: i for i, attr in enumerate(self.attrs)}
+
+
+class Row(Mapping):
+    """
+    Компактная запись таблицы: значения хранятся в кортеже,
+    имена атрибутов - в общей для таблицы схеме.
+    Ведёт себя как словарь только для чтения.
+    """
+
+    __slots__ = ("_schema", "_values")
+
+    def __init__(self, schema, values):
+        self._schema = schema
+        self._values = tuple(values)
+
+    def __getitem__(self, key):
+        try:
+            return self._values[self._schema.index[key]]
+        except IndexError:
+            # запись короче схемы (как dict(zip(...)) при нехватке значений)
+            raise KeyError(key) from None
+
+    def __contains__(self, key):
+        return self._schema.index.get(key, len(self._values)) < len(self._values)
+
+    def get(self, key, default=None):
+        i = self._schema.index.get(key, len(self._values))
+        return self._values[i] if i < len(self._values) else default
+
+    def __iter__(self):
+        return iter(self._schema.attrs[: len(self._values)])
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return repr(self.asDict())
+
+    def asTuple(self):
+        return self._values
+
+    def asDict(self):
+        return dict(zip(self._schema.attrs, self._values))
+
+    def copy(self):
+        # изменяемая копия, как у dict.copy()
+        return self.asDict()
+
+
+class JoinedRow(Mapping):
+    """
+    Результат объединения двух записей. Не копирует данные, а ссылается
+    на обе исходные записи: атрибут 'id' правой записи доступен под
+    именем joinAttr, остальные атрибуты правой записи перекрывают левую.
+    """
+
+    __slots__ = ("_left", "_right", "_joinAttr")
+
+    def __init__(self, left, right, joinAttr):
+        self._left = left
+        self._right = right
+        self._joinAttr = joinAttr
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        if key == self._joinAttr:
+            return self._right["id"]
+        if key != "id":
+            value = self._right.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+        return self._left.get(key, default)
+
+    def __contains__(self, key):
+        return (
+            key == self._joinAttr
+            or key in self._left
+            or (key != "id" and key in self._right)
+        )
+
+    def __iter__(self):
+        yield from self._left
+        for key in self._right:
+            if key != "id" and key not in self._left:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(self.asDict())
+
+    def asDict(self):
+        return dict(self.items())
+
+    def copy(self):
+        # изменяемая копия, как у dict.copy()
+        return self.asDict()
+
+
+class BaseDatabase:
+    """
+    Методы чтения, общие для БД и её снимков:
+    поиск таблицы, выборка, объединение и агрегация.
+    """
 
     def isTableExist(self, tableName):
         table = self.tables.get(tableName)
@@ -30,10 +148,6 @@ class Database(metaclass=SingletonMeta):
             raise ValueError(f"Table {tableName} does not exists.")
         return table
 
-    def insert(self, tableName, data):
-        table = self.isTableExist(tableName)
-        table.insert(data)
-
     def select(self, tableName, attr=None, value=None, start=0, end=math.inf):
         """
         Выполняет выборку из таблицы с возможностью фильтрации по атрибуту.
@@ -63,10 +177,6 @@ class Database(metaclass=SingletonMeta):
 
         return selectedRecords
 
-    def load(self, tableName):
-        table = self.isTableExist(tableName)
-        table.load()
-
     """
     объединение выполняется для левой таблицы по id правой таблицы
     UPD: если в качестве таблицы передано имя - выполняется поиск в БД
@@ -86,15 +196,19 @@ class Database(metaclass=SingletonMeta):
         else:
             rightTableRecords = tableRight
 
+        # для каждого id берётся первая запись правой таблицы,
+        # записи без id пропускаются
+        rightIndex = {}
+        for rightRecord in rightTableRecords:
+            rightId = rightRecord.get("id")
+            if rightId is not None:
+                rightIndex.setdefault(rightId, rightRecord)
+
         mergedTable = []
         for leftRecord in leftTableRecords:
-            for rightRecord in rightTableRecords:
-                if leftRecord[joinAttr] == rightRecord["id"]:
-                    rightRecordCopy = rightRecord.copy()
-                    rightRecordCopy[joinAttr] = rightRecordCopy.pop("id")
-                    mergedRecord = {**leftRecord, **rightRecordCopy}
-                    mergedTable.append(mergedRecord)
-                    break
+            rightRecord = rightIndex.get(leftRecord[joinAttr])
+            if rightRecord is not None:
+                mergedTable.append(JoinedRow(leftRecord, rightRecord, joinAttr))
         return mergedTable
 
     def aggregate(self, aggrMethod, attr, table):
@@ -135,6 +249,107 @@ class Database(metaclass=SingletonMeta):
                 raise ValueError(f"Can't find {aggrMethod} method.")
 
 
+class Database(BaseDatabase, metaclass=SingletonMeta):
+
+    def __init__(self):
+        self.tables = {}
+        self.lock = threading.Lock()
+
+    def registerTable(self, tableName, table):
+        with self.lock:
+            if tableName in self.tables:
+                raise ValueError(f"Table {tableName} already exists.")
+            self.tables[tableName] = table
+
+    def insert(self, tableName, data):
+        table = self.isTableExist(tableName)
+        with self.lock:
+            table.insert(data)
+
+    def load(self, tableName):
+        table = self.isTableExist(tableName)
+        with self.lock:
+            table.load()
+
+    def snapshot(self):
+        """
+        Согласованный снимок всех таблиц БД на текущий момент.
+        Снимок не копирует записи: таблица копирует свой список
+        записей только при первой записи после снятия снимка.
+        """
+        with self.lock:
+            return Snapshot(
+                {name: table.snapshot() for name, table in self.tables.items()}
+            )
+
+    def backup(self, directory):
+        """
+        Сохраняет согласованную копию всех таблиц в directory.
+        Блокировка удерживается только на время снятия снимка,
+        вставки во время записи файлов не ждут.
+        """
+        return self.snapshot().backup(directory)
+
+
+class Snapshot(BaseDatabase):
+    """Снимок БД только для чтения: поддерживает select, join и aggregate."""
+
+    def __init__(self, tables):
+        self.tables = tables
+
+    def backup(self, directory):
+        paths = [
+            os.path.join(directory, os.path.basename(table.FILE_PATH))
+            for table in self.tables.values()
+        ]
+        # копия не должна перезаписывать рабочие файлы таблиц
+        # и копии других таблиц с тем же именем файла
+        targets = set()
+        for table, path in zip(self.tables.values(), paths):
+            target = os.path.abspath(path)
+            if target == os.path.abspath(table.FILE_PATH):
+                raise ValueError(f"Backup path {path} is the table file.")
+            if target in targets:
+                raise ValueError(f"Backup path {path} is used by several tables.")
+            targets.add(target)
+        for table, path in zip(self.tables.values(), paths):
+            table.save(path)
+        return paths
+
+
+class TableSnapshot:
+    """Неизменяемое состояние таблицы на момент снятия снимка."""
+
+    def __init__(self, attrs, filePath, data):
+        self.ATTRS = attrs
+        self.FILE_PATH = filePath
+        self.data = data
+
+    def save(self, path):
+        # файл пишется под уникальным временным именем и заменяется
+        # целиком, прерванная запись не оставляет обрезанный CSV
+        fd, tempPath = tempfile.mkstemp(
+            dir=os.path.dirname(path) or ".",
+            prefix=os.path.basename(path) + ".",
+            suffix=".tmp",
+        )
+        os.close(fd)
+        try:
+            writeCsv(tempPath, self.ATTRS, self.data)
+        except BaseException:
+            os.remove(tempPath)
+            raise
+        os.replace(tempPath, path)
+
+
+def writeCsv(path, attrs, records):
+    # записи пишутся в файл потоком, без промежуточных словарей
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(attrs)
+        writer.writerows(record.asTuple() for record in records)
+
+
 class Table(ABC):  # pragma: no cover
     """Абстрактный базовый класс для таблиц с вводом/выводом файлов CSV."""
 
@@ -151,41 +366,79 @@ class BaseTable(Table):
 
     ATTRS = ()
     FILE_PATH = ""
+    SCHEMA = Schema(ATTRS)
+
+    def __init_subclass__(cls, **kwargs):
+        # одна схема на таблицу, общая для всех её записей
+        super().__init_subclass__(**kwargs)
+        cls.SCHEMA = Schema(cls.ATTRS)
 
     def __init__(self):
         self.data = []
         self.keys = set()
+        # список data используется снимком и должен быть скопирован
+        # перед изменением
+        self.shared = False
         self.load()
 
     def insert(self, data):
-        entry = dict(zip(self.ATTRS, data.split()))
+        entry = Row(self.SCHEMA, data.split()[: len(self.ATTRS)])
         entryKeys = self.get_entry_keys(entry)
         if entryKeys in self.keys:
             raise ValueError(f"Entry with keys {entryKeys} already exists.")
+        self.unshare()
         self.data.append(entry)
         self.keys.add(entryKeys)
         self.save()
 
     def save(self):
-        with open(self.FILE_PATH, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=self.ATTRS)
-            writer.writeheader()
-            writer.writerows(self.data)
+        writeCsv(self.FILE_PATH, self.ATTRS, self.data)
+
+    def snapshot(self):
+        self.shared = True
+        return TableSnapshot(self.ATTRS, self.FILE_PATH, self.data)
+
+    def unshare(self):
+        if self.shared:
+            self.data = list(self.data)
+            self.shared = False
 
     def load(self):
         if os.path.exists(self.FILE_PATH):
             with open(self.FILE_PATH, "r") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
+                reader = csv.reader(f)
+                header = next(reader, None)
+                if header is None:
+                    return
+                # порядок столбцов в файле может отличаться от ATTRS,
+                # отсутствующие столбцы и поля читаются как None
+                # (как restval у csv.DictReader)
+                positions = [
+                    header.index(attr) if attr in header else None
+                    for attr in self.ATTRS
+                ]
+                for values in reader:
+                    # пустые строки пропускаются, как в csv.DictReader
+                    if not values:
+                        continue
+                    row = Row(
+                        self.SCHEMA,
+                        [
+                            values[i] if i is not None and i < len(values) else None
+                            for i in positions
+                        ],
+                    )
                     entryKeys = self.get_entry_keys(row)
                     if entryKeys in self.keys:
                         print(f"Entry with keys {entryKeys} already exists.")
                     else:
+                        self.unshare()
                         self.data.append(row)
                         self.keys.add(entryKeys)
         else:
             self.data = []
             self.keys = set()
+            self.shared = False
 
     def get_entry_keys(self, entry):
         """
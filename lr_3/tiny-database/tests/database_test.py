@@ -1,8 +1,9 @@
 import pytest
 import os
 import tempfile
+import database.database as database_module
 from database.database import Database, EmployeeTable
-from database.database import DepartmentTable, SalesTable
+from database.database import DepartmentTable, SalesTable, Row, JoinedRow
 
 
 @pytest.fixture
@@ -388,3 +389,248 @@ def test_aggregation(database):
 
     aggregate_data = database.aggregate("max", "name", test_table)
     assert aggregate_data == "Maximum name: Test."
+
+
+"""
+группа тестов на компактные записи
+"""
+
+
+def test_row(database):
+    database.load("departments")  # пустой файл не меняет таблицу
+    database.insert("departments", "1 HR")
+
+    record = database.select("departments")[0]
+    assert isinstance(record, Row)
+    assert len(record) == 2
+    assert record.asTuple() == ("1", "HR")
+    assert record.asDict() == {"id": "1", "department_name": "HR"}
+    assert repr(record) == "{'id': '1', 'department_name': 'HR'}"
+    assert record.get("test", "default") == "default"
+    assert "test" not in record
+
+    # записи хранят значения в кортеже и не имеют __dict__
+    assert not hasattr(record, "__dict__")
+
+    # записи с нехваткой значений ведут себя как dict(zip(...))
+    with pytest.raises(KeyError):
+        database.insert("employees", "3 Bob")
+
+
+def test_joined_row(database):
+    database.insert("employees", "1 Alice 30 70000 1")
+    database.insert("departments", "1 HR")
+
+    employee = database.select("employees")[0]
+    department = database.select("departments")[0]
+    record = database.join("employees", "departments", "department_id")[0]
+
+    # объединённая запись ссылается на исходные записи без копирования
+    assert isinstance(record, JoinedRow)
+    assert record._left is employee
+    assert record._right is department
+
+    assert len(record) == 6
+    assert list(record) == [
+        "id",
+        "name",
+        "age",
+        "salary",
+        "department_id",
+        "department_name",
+    ]
+    assert record.get("department_id") == "1"
+    assert record.get("department_name") == "HR"
+    assert record.get("test") is None
+    assert record.asDict() == {
+        "id": "1",
+        "name": "Alice",
+        "age": "30",
+        "salary": "70000",
+        "department_id": "1",
+        "department_name": "HR",
+    }
+    assert repr(record) == repr(record.asDict())
+
+    # записи только для чтения, copy() возвращает изменяемый словарь
+    with pytest.raises(TypeError):
+        record["name"] = "Bob"
+    copied = record.copy()
+    copied["name"] = "Bob"
+    assert record["name"] == "Alice"
+    assert employee.copy() == {
+        "id": "1",
+        "name": "Alice",
+        "age": "30",
+        "salary": "70000",
+        "department_id": "1",
+    }
+    with pytest.raises(KeyError):
+        record["test"]
+
+    # записи правой таблицы без id не участвуют в объединении
+    assert database.join([], [{"x": 1}], "a") == []
+    assert len(database.join("employees", [{"x": 1}, department], "department_id")) == 1
+
+
+"""
+группа тестов на снимки и резервное копирование
+"""
+
+
+def test_snapshot(database, temp_employee_file):
+    database.insert("employees", "1 Alice 30 70000 1")
+    database.insert("departments", "1 HR")
+
+    snapshot = database.snapshot()
+
+    # изменения после снятия снимка не видны в снимке
+    database.insert("employees", "2 Bob 28 60000 1")
+    database.insert("departments", "2 Finance")
+    with open(temp_employee_file, "a") as f:
+        f.write("3,Charlie,22,50000,2\n")
+    database.load("employees")
+
+    assert len(database.select("employees")) == 3
+    assert len(snapshot.select("employees")) == 1
+    assert len(snapshot.select("departments")) == 1
+
+    joined_data = snapshot.join("employees", "departments", "department_id")
+    assert joined_data == [
+        {
+            "id": "1",
+            "name": "Alice",
+            "age": "30",
+            "salary": "70000",
+            "department_id": "1",
+            "department_name": "HR",
+        }
+    ]
+    assert snapshot.aggregate("count", "id", joined_data) == "Count id: 1."
+
+    # снимок доступен только для чтения
+    assert not hasattr(snapshot, "insert")
+    with pytest.raises(ValueError) as excinfo:
+        snapshot.select("test")
+    assert str(excinfo.value) == "Table test does not exists."
+
+
+def test_backup(database):
+    database.insert("employees", "1 Alice 30 70000 1")
+    database.insert("departments", "1 HR")
+    database.insert("sales", "1 Smartphone 29900 1")
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = database.backup(directory)
+        assert len(paths) == 3
+
+        with open(paths[1]) as f:
+            assert f.read() == "id,department_name\n1,HR\n"
+
+        # копия читается таблицей так же, как исходный файл
+        sales_table = SalesTable()
+        sales_table.FILE_PATH = paths[2]
+        sales_table.load()
+        assert database.select(sales_table.data) == database.select("sales")
+
+
+def test_read_irregular_csv(database, temp_department_file, temp_employee_file):
+    with open(temp_department_file, "w") as f:
+        f.write("id,department_name\n")
+        f.write("1,HR\n")
+        f.write("\n")  # пустая строка пропускается
+        f.write("2,IT\n")
+        f.write("3\n")  # недостающее поле читается как None
+
+    database.load("departments")
+    assert database.select("departments") == [
+        {"id": "1", "department_name": "HR"},
+        {"id": "2", "department_name": "IT"},
+        {"id": "3", "department_name": None},
+    ]
+
+    # столбца salary нет в файле
+    with open(temp_employee_file, "w") as f:
+        f.write("id,name,age,department_id\n")
+        f.write("1,Alice,30,1\n")
+
+    database.load("employees")
+    assert database.select("employees") == [
+        {
+            "id": "1",
+            "name": "Alice",
+            "age": "30",
+            "salary": None,
+            "department_id": "1",
+        }
+    ]
+
+
+def test_backup_to_table_directory(database, temp_department_file):
+    database.insert("departments", "1 HR")
+    snapshot = database.snapshot()
+    database.insert("departments", "2 IT")
+
+    # копия в каталог рабочих файлов перезаписала бы их старым снимком
+    directory = os.path.dirname(temp_department_file)
+    with pytest.raises(ValueError) as excinfo:
+        snapshot.backup(directory)
+    assert "is the table file." in str(excinfo.value)
+
+    with open(temp_department_file) as f:
+        assert f.read() == "id,department_name\n1,HR\n2,IT\n"
+
+
+def test_backup_interrupted(database, monkeypatch):
+    database.insert("departments", "1 HR")
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = database.backup(directory)
+        assert sorted(os.listdir(directory)) == sorted(
+            os.path.basename(path) for path in paths
+        )
+
+        # запись прерывается после заголовка
+        def failingWriteCsv(path, attrs, records):
+            with open(path, "w") as f:
+                f.write(",".join(attrs) + "\n")
+            raise OSError("disk full")
+
+        database.insert("departments", "2 IT")
+        monkeypatch.setattr(database_module, "writeCsv", failingWriteCsv)
+        with pytest.raises(OSError) as excinfo:
+            database.backup(directory)
+        assert str(excinfo.value) == "disk full"
+
+        # предыдущая копия не испорчена, временный файл удалён
+        with open(paths[1]) as f:
+            assert f.read() == "id,department_name\n1,HR\n"
+        assert not any(name.endswith(".tmp") for name in os.listdir(directory))
+
+
+def test_backup_missing_directory(database):
+    with tempfile.TemporaryDirectory() as directory:
+        missing = os.path.join(directory, "missing")
+
+        # ошибка создания файла не подменяется ошибкой очистки
+        with pytest.raises(FileNotFoundError) as excinfo:
+            database.backup(missing)
+        assert excinfo.value.__context__ is None
+
+
+def test_backup_same_file_names(database, temp_department_file):
+    with (
+        tempfile.TemporaryDirectory() as directory,
+        tempfile.TemporaryDirectory() as backupDirectory,
+    ):
+        sales_table = SalesTable()
+        sales_table.FILE_PATH = os.path.join(
+            directory, os.path.basename(temp_department_file)
+        )
+        database.tables["sales"] = sales_table
+
+        # копии двух таблиц попали бы в один файл
+        with pytest.raises(ValueError) as excinfo:
+            database.backup(backupDirectory)
+        assert "is used by several tables." in str(excinfo.value)
+        assert os.listdir(backupDirectory) == []